@@ -9,6 +9,7 @@ Usage:
     python scripts/inspect_template.py <template.docx>
 """
 
+import re
 import sys
 from pathlib import Path
 
@@ -19,6 +20,9 @@ except ImportError:
     print("Install with: pip install python-docx")
     sys.exit(1)
 
+# Words that commonly mark a fill-in point
+ANCHOR_PATTERN = re.compile(r'Answer|Summary|FILL|Response|Solution')
+
 
 def inspect_template(doc_path):
     """
@@ -43,63 +47,73 @@ def inspect_template(doc_path):
 
     doc = Document(doc_path)
 
-    print("=" * 70)
-    print("TEMPLATE STRUCTURE ANALYSIS")
-    print("=" * 70)
+    # python-docx rebuilds these lists from the XML on every access
+    tables = doc.tables
+    paragraphs = doc.paragraphs
+    sections = doc.sections
+
+    # Collect the report and write it in one call
+    out = []
+    out.append("=" * 70)
+    out.append("TEMPLATE STRUCTURE ANALYSIS")
+    out.append("=" * 70)
 
     # 1. High-level counts
-    print(f"\nDocument Elements:")
-    print(f"  Tables: {len(doc.tables)}")
-    print(f"  Paragraphs: {len(doc.paragraphs)}")
-    print(f"  Sections: {len(doc.sections)}")
+    out.append(f"\nDocument Elements:")
+    out.append(f"  Tables: {len(tables)}")
+    out.append(f"  Paragraphs: {len(paragraphs)}")
+    out.append(f"  Sections: {len(sections)}")
 
     # 2. Table identities
-    print(f"\nTable Analysis:")
-    for i, table in enumerate(doc.tables):
-        first_cell = table.rows[0].cells[0].text[:60] if table.rows else ""
-        print(f"  Table {i}:")
-        print(f"    Size: {len(table.rows)}x{len(table.columns)}")
-        print(f"    First cell: '{first_cell}...'")
+    out.append(f"\nTable Analysis:")
+    for i, table in enumerate(tables):
+        # Only the first row is sampled; build its cells once
+        rows = table.rows
+        first_row_cells = rows[0].cells if len(rows) else ()
+        first_row_texts = [c.text for c in first_row_cells]
+        first_cell = first_row_texts[0][:60] if first_row_texts else ""
+        out.append(f"  Table {i}:")
+        out.append(f"    Size: {len(rows)}x{len(table.columns)}")
+        out.append(f"    First cell: '{first_cell}...'")
 
         # Sample first row to identify table type
-        if table.rows and table.rows[0].cells:
-            first_row_text = " | ".join([c.text[:20] for c in table.rows[0].cells])
-            print(f"    First row: {first_row_text}")
+        if first_row_texts:
+            first_row_text = " | ".join([t[:20] for t in first_row_texts])
+            out.append(f"    First row: {first_row_text}")
 
     # 3. Potential anchor points
-    print(f"\nPotential Anchor Points:")
+    out.append(f"\nPotential Anchor Points:")
     anchors_found = 0
-    for i, para in enumerate(doc.paragraphs):
+    for i, para in enumerate(paragraphs):
         text = para.text.strip()
 
         # Common anchor patterns
         if (text.endswith(':') or
-            'Answer' in text or
-            'Summary' in text or
-            'FILL' in text or
-            'Response' in text or
-            'Solution' in text or
-            text in ['', '\n']):  # Empty paragraphs might be fill points
-
-            print(f"  Para {i}: '{text}' (style: {para.style.name})")
+            ANCHOR_PATTERN.search(text) or
+            not text):  # Empty paragraphs might be fill points
+
+            out.append(f"  Para {i}: '{text}' (style: {para.style.name})")
             anchors_found += 1
 
             if anchors_found > 20:  # Limit output
-                print(f"  ... ({len(doc.paragraphs) - i} more paragraphs)")
+                out.append(f"  ... ({len(paragraphs) - i} more paragraphs)")
                 break
 
     # 4. Headers/Footers
-    print(f"\nHeaders/Footers:")
-    for i, section in enumerate(doc.sections):
-        header_text = section.header.paragraphs[0].text[:50] if section.header.paragraphs else "(empty)"
-        footer_text = section.footer.paragraphs[0].text[:50] if section.footer.paragraphs else "(empty)"
-        print(f"  Section {i}:")
-        print(f"    Header: {header_text}")
-        print(f"    Footer: {footer_text}")
-
-    print("=" * 70)
-    print("\nNow safe to proceed with modifications.")
-    print("=" * 70)
+    out.append(f"\nHeaders/Footers:")
+    for i, section in enumerate(sections):
+        header_paras = section.header.paragraphs
+        footer_paras = section.footer.paragraphs
+        header_text = header_paras[0].text[:50] if header_paras else "(empty)"
+        footer_text = footer_paras[0].text[:50] if footer_paras else "(empty)"
+        out.append(f"  Section {i}:")
+        out.append(f"    Header: {header_text}")
+        out.append(f"    Footer: {footer_text}")
+
+    out.append("=" * 70)
+    out.append("\nNow safe to proceed with modifications.")
+    out.append("=" * 70)
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
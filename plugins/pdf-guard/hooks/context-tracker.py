@@ -15,8 +15,8 @@ Features:
 
 import json
 import os
+import stat
 import sys
-from pathlib import Path
 from collections import defaultdict
 
 # Thresholds (estimated tokens)
@@ -25,8 +25,11 @@ WARN_CUMULATIVE = 100_000  # Warn at ~100K tokens read
 BLOCK_CUMULATIVE = 150_000  # Block at ~150K tokens (leave room for conversation)
 
 # State file (per session)
-STATE_DIR = Path.home() / ".claude" / "state"
+# Plain os.path strings: pathlib costs ~10 ms to import in a short-lived hook
+STATE_DIR = os.path.join(os.path.expanduser("~"), ".claude", "state")
 BYTES_PER_TOKEN = 4
+# The read log is rotated past this size; the state file keeps the totals
+LOG_MAX_BYTES = 1 << 20
 
 # File type categories for intelligent partitioning
 FILE_CATEGORIES = {
@@ -50,6 +53,18 @@ FILE_CATEGORIES = {
     "test": ["test_", "_test.", ".test.", "spec_", "_spec."],
 }
 
+# Flattened lookups so categorization is a dict hit instead of a nested scan
+TEST_PATTERNS = tuple(FILE_CATEGORIES["test"])
+EXT_TO_CATEGORY = {
+    ext: category
+    for category, extensions in FILE_CATEGORIES.items()
+    if category != "test"
+    for ext in extensions
+}
+
+# Images and PDFs are handled by the other hooks
+SKIP_SUFFIXES = (".pdf", ".png", ".jpg", ".jpeg", ".gif", ".webp")
+
 
 def categorize_file(filepath: str) -> str:
     """Categorize a file by its type/purpose."""
@@ -57,19 +72,15 @@ def categorize_file(filepath: str) -> str:
     basename = os.path.basename(lower_path)
 
     # Check for test files first (by name pattern)
-    for pattern in FILE_CATEGORIES["test"]:
+    for pattern in TEST_PATTERNS:
         if pattern in basename:
             return "test"
 
     # Check by extension
-    for category, extensions in FILE_CATEGORIES.items():
-        if category == "test":
-            continue
-        for ext in extensions:
-            if lower_path.endswith(ext):
-                return category
-
-    return "other"
+    _, dot, ext = basename.rpartition(".")
+    if not dot:
+        return "other"
+    return EXT_TO_CATEGORY.get("." + ext, "other")
 
 
 def get_session_id() -> str:
@@ -85,23 +96,17 @@ def is_subagent(data: dict) -> bool:
     """Detect if running inside a subagent context.
 
     Subagents have fresh 200K context and should NOT inherit parent's token count.
-    Detection methods:
-    1. CLAUDE_SUBAGENT env var (user can set to bypass)
-    2. CLAUDE_SKIP_CONTEXT_TRACKING env var (explicit bypass)
-    3. Check hook data for subagent indicators
+    Detection methods (the CLAUDE_SUBAGENT / CLAUDE_SKIP_CONTEXT_TRACKING env
+    bypasses are checked in main() before the hook input is parsed):
+    1. Check hook data for subagent indicators
+    2. Check session_id naming
     """
-    # Method 1: Explicit env var bypass
-    if os.environ.get("CLAUDE_SUBAGENT"):
-        return True
-    if os.environ.get("CLAUDE_SKIP_CONTEXT_TRACKING"):
-        return True
-
-    # Method 2: Check hook data for subagent indicators
+    # Method 1: Check hook data for subagent indicators
     # Subagents may have specific metadata or different session patterns
     if data.get("is_subagent"):
         return True
 
-    # Method 3: Check if session_id indicates a subagent (heuristic)
+    # Method 2: Check if session_id indicates a subagent (heuristic)
     # Main sessions typically have UUID format; subagents might differ
     session_id = data.get("session_id", "")
     if session_id.startswith("subagent-") or session_id.startswith("task-"):
@@ -110,29 +115,53 @@ def is_subagent(data: dict) -> bool:
     return False
 
 
-def get_state_file(session_id: str) -> Path:
+def get_state_file(session_id: str) -> str:
     """Get state file path for this session."""
-    STATE_DIR.mkdir(parents=True, exist_ok=True)
-    return STATE_DIR / f"read_tracker_{session_id}.json"
+    return os.path.join(STATE_DIR, f"read_tracker_{session_id}.json")
+
+
+def get_log_file(session_id: str) -> str:
+    """Get the append-only read log path for this session."""
+    return os.path.join(STATE_DIR, f"read_tracker_{session_id}.log")
 
 
 def load_state(session_id: str) -> dict:
     """Load read tracking state for session."""
     state_file = get_state_file(session_id)
-    if state_file.exists():
-        try:
-            return json.loads(state_file.read_text())
-        except Exception:
-            pass
+    # Open directly rather than exists() + read: a missing file is the
+    # first-read case and costs one failed open instead of two stats
+    try:
+        with open(state_file, encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception:
+        pass
+    else:
+        # Older sessions kept every read inline under "files"; that history
+        # now lives in the read log, so drop it to keep saves small
+        state.pop("files", None)
+        return state
     return {
         "total_bytes": 0,
         "read_count": 0,
-        "files": [],
         "categories": defaultdict(int),
         "directories": defaultdict(int),
+        "top_category": [None, 0],
+        "top_directory": [None, 0],
     }
 
 
+def increment_tally(state: dict, tally: str, leader: str, name: str):
+    """Count one more read for `name` and keep the running leader current.
+
+    state[leader] holds [name, count] for the largest entry of state[tally],
+    so suggestions never have to scan the whole tally.
+    """
+    counts = state[tally]
+    counts[name] += 1
+    if counts[name] > state[leader][1]:
+        state[leader] = [name, counts[name]]
+
+
 def save_state(session_id: str, state: dict):
     """Save read tracking state."""
     state_file = get_state_file(session_id)
@@ -142,23 +171,59 @@ def save_state(session_id: str, state: dict):
         state_copy["categories"] = dict(state_copy["categories"])
     if isinstance(state_copy.get("directories"), defaultdict):
         state_copy["directories"] = dict(state_copy["directories"])
-    state_file.write_text(json.dumps(state_copy, indent=2))
+    # Compact JSON via a temp file + rename: one write per save, and a crash
+    # mid-write can never leave a truncated state file behind
+    payload = json.dumps(state_copy, separators=(",", ":")).encode("utf-8")
+    tmp_file = f"{state_file}.{os.getpid()}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    try:
+        fd = os.open(tmp_file, flags, 0o600)
+    except FileNotFoundError:
+        # First save on this machine: create the state dir only when needed,
+        # instead of a mkdir() on every hook call
+        os.makedirs(STATE_DIR, exist_ok=True)
+        fd = os.open(tmp_file, flags, 0o600)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+    os.replace(tmp_file, state_file)
+
+
+def log_read(session_id: str, file_path: str, size: int, category: str):
+    """Append one read to the session log.
+
+    The per-file history lives here rather than in the state file, so each
+    save only rewrites the summary counts instead of a list that grows
+    with every read. Once the log passes LOG_MAX_BYTES it is moved to
+    <log>.1 (replacing the previous one), so a session keeps at most about
+    two logs' worth of history on disk.
+    """
+    log_file = get_log_file(session_id)
+    entry = {"path": file_path, "size": size, "category": category}
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        # Position after an append is the file size, so no extra stat
+        full = f.tell() > LOG_MAX_BYTES
+    if full:
+        os.replace(log_file, log_file + ".1")
 
 
 def get_file_size(path: str) -> int | None:
-    """Get file size."""
+    """Get file size, or None unless path is a regular file.
+
+    The type check reuses the same stat() result, so directories and other
+    non-files (which Read rejects anyway) are never counted as tokens.
+    """
     try:
-        path = os.path.expanduser(path)
-        return os.path.getsize(path)
+        st = os.stat(os.path.expanduser(path))
     except Exception:
         return None
+    return st.st_size if stat.S_ISREG(st.st_mode) else None
 
 
 def suggest_rlm_strategy(state: dict, new_file: str) -> dict:
     """Generate RLM-aware delegation suggestions based on file patterns."""
-    categories = state.get("categories", {})
-    directories = state.get("directories", {})
-
     suggestions = {
         "strategy": None,
         "rationale": None,
@@ -170,32 +235,30 @@ def suggest_rlm_strategy(state: dict, new_file: str) -> dict:
     total_files = state.get("read_count", 0)
 
     # If reading many files from same directory, suggest partition by directory
-    if directories:
-        max_dir = max(directories.items(), key=lambda x: x[1])
-        if max_dir[1] >= 5:
-            suggestions["strategy"] = "partition-by-directory"
-            suggestions["rationale"] = (
-                f"Reading many files from {max_dir[0]} ({max_dir[1]} files)"
-            )
-            suggestions["subagent_type"] = "Explore"
-            suggestions["partition_hint"] = (
-                f"Consider spawning subagent for {max_dir[0]}/* analysis"
-            )
+    max_dir = state.get("top_directory", [None, 0])
+    if max_dir[1] >= 5:
+        suggestions["strategy"] = "partition-by-directory"
+        suggestions["rationale"] = (
+            f"Reading many files from {max_dir[0]} ({max_dir[1]} files)"
+        )
+        suggestions["subagent_type"] = "Explore"
+        suggestions["partition_hint"] = (
+            f"Consider spawning subagent for {max_dir[0]}/* analysis"
+        )
 
     # If reading many of same type, suggest partition by type
-    if categories:
-        max_cat = max(categories.items(), key=lambda x: x[1])
-        if max_cat[1] >= 5 and not suggestions["strategy"]:
-            suggestions["strategy"] = "partition-by-type"
-            suggestions["rationale"] = (
-                f"Reading many {max_cat[0]} files ({max_cat[1]} files)"
-            )
-            suggestions["subagent_type"] = (
-                "Explore" if max_cat[0] in ["docs", "config"] else "general-purpose"
-            )
-            suggestions["partition_hint"] = (
-                f"Consider spawning subagent for all {max_cat[0]} files"
-            )
+    max_cat = state.get("top_category", [None, 0])
+    if max_cat[1] >= 5 and not suggestions["strategy"]:
+        suggestions["strategy"] = "partition-by-type"
+        suggestions["rationale"] = (
+            f"Reading many {max_cat[0]} files ({max_cat[1]} files)"
+        )
+        suggestions["subagent_type"] = (
+            "Explore" if max_cat[0] in ["docs", "config"] else "general-purpose"
+        )
+        suggestions["partition_hint"] = (
+            f"Consider spawning subagent for all {max_cat[0]} files"
+        )
 
     # If we've read a lot already, suggest grep-first strategy
     if total_files >= 10 and not suggestions["strategy"]:
@@ -259,9 +322,16 @@ def generate_delegation_guidance(
 
 
 def main():
+    # Explicit bypasses need no hook input, so exit before reading stdin
+    if os.environ.get("CLAUDE_SUBAGENT") or os.environ.get(
+        "CLAUDE_SKIP_CONTEXT_TRACKING"
+    ):
+        sys.exit(0)
+
     try:
-        data = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        # Decode the raw bytes in one go rather than through the text wrapper
+        data = json.loads(sys.stdin.buffer.read())
+    except ValueError:  # JSONDecodeError or undecodable bytes
         sys.exit(0)
 
     tool_name = data.get("tool_name", "")
@@ -277,11 +347,7 @@ def main():
     session_id = data.get("session_id", "unknown")
 
     # Skip images and PDFs (handled separately)
-    lower_path = file_path.lower()
-    if any(
-        lower_path.endswith(ext)
-        for ext in [".pdf", ".png", ".jpg", ".jpeg", ".gif", ".webp"]
-    ):
+    if file_path.lower().endswith(SKIP_SUFFIXES):
         sys.exit(0)
 
     # Get file size
@@ -298,6 +364,17 @@ def main():
     if not isinstance(state.get("directories"), defaultdict):
         state["directories"] = defaultdict(int, state.get("directories", {}))
 
+    # State saved before running leaders were tracked: derive them once
+    for tally, leader in (
+        ("categories", "top_category"),
+        ("directories", "top_directory"),
+    ):
+        if leader not in state:
+            counts = state[tally]
+            state[leader] = (
+                list(max(counts.items(), key=lambda x: x[1])) if counts else [None, 0]
+            )
+
     current_total = state["total_bytes"]
     new_total = current_total + size
     estimated_tokens = new_total // BYTES_PER_TOKEN
@@ -305,8 +382,8 @@ def main():
     # Track file category and directory
     category = categorize_file(file_path)
     directory = os.path.dirname(file_path)
-    state["categories"][category] += 1
-    state["directories"][directory] += 1
+    increment_tally(state, "categories", "top_category", category)
+    increment_tally(state, "directories", "top_directory", directory)
 
     # At extreme limits, warn strongly but don't block (blocking breaks subagents)
     # Set CLAUDE_BLOCK_AT_LIMIT=1 to enable hard blocking if desired
@@ -349,8 +426,8 @@ def main():
     # Update state
     state["total_bytes"] = new_total
     state["read_count"] += 1
-    state["files"].append({"path": file_path, "size": size, "category": category})
     save_state(session_id, state)
+    log_read(session_id, file_path, size, category)
 
     sys.exit(0)
 
@@ -6,6 +6,7 @@ Suggests chunked reading or subagent delegation for files over threshold.
 
 import json
 import os
+import stat
 import sys
 
 # Thresholds (in bytes)
@@ -16,23 +17,28 @@ BLOCK_SIZE = 200_000  # 200KB - block before Claude Code's 256KB internal limit
 BYTES_PER_TOKEN = 4
 MAX_READ_TOKENS = 25_000  # Claude Code's hardcoded limit
 
+# Images are handled differently by Read
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
 
 def get_file_size(path: str) -> int | None:
-    """Get file size, return None if file doesn't exist."""
+    """Get file size, return None if path is missing or not a regular file."""
     try:
         # Handle Windows paths
         path = path.replace("/", os.sep).replace("\\", os.sep)
         if path.startswith("~"):
             path = os.path.expanduser(path)
-        return os.path.getsize(path)
+        st = os.stat(path)
     except (OSError, FileNotFoundError):
         return None
+    return st.st_size if stat.S_ISREG(st.st_mode) else None
 
 
 def main():
     try:
-        data = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        # Decode the raw bytes in one go rather than through the text wrapper
+        data = json.loads(sys.stdin.buffer.read())
+    except ValueError:  # JSONDecodeError or undecodable bytes
         sys.exit(0)
 
     tool_name = data.get("tool_name", "")
@@ -49,15 +55,14 @@ def main():
     if offset is not None or limit is not None:
         sys.exit(0)
 
+    lower_path = file_path.lower()
+
     # Skip PDFs (handled by pdf-blocker.py)
-    if file_path.lower().endswith(".pdf"):
+    if lower_path.endswith(".pdf"):
         sys.exit(0)
 
     # Skip images (handled differently)
-    if any(
-        file_path.lower().endswith(ext)
-        for ext in [".png", ".jpg", ".jpeg", ".gif", ".webp"]
-    ):
+    if lower_path.endswith(IMAGE_SUFFIXES):
         sys.exit(0)
 
     size = get_file_size(file_path)
@@ -5,13 +5,19 @@ Forces Claude to use extraction scripts instead of Read tool on PDFs.
 """
 
 import json
+import os
 import sys
 
 
 def main():
+    # Explicit bypass, checked before the hook input is parsed
+    if os.environ.get("CLAUDE_PDF_GUARD_DISABLE"):
+        sys.exit(0)
+
     try:
-        data = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        # Decode the raw bytes in one go rather than through the text wrapper
+        data = json.loads(sys.stdin.buffer.read())
+    except ValueError:  # JSONDecodeError or undecodable bytes
         sys.exit(0)  # Allow if can't parse
 
     tool_name = data.get("tool_name", "")
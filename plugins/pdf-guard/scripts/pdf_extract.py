@@ -4,7 +4,7 @@ Global PDF Extraction Tool for Claude Code
 Extracts text (with page markers) and images from PDFs safely.
 
 Usage:
-    python pdf_extract.py <pdf_path> [--text-only] [--images-only]
+    python pdf_extract.py <pdf_path> [--text-only] [--images-only] [--jobs N]
 
 Output:
     <pdf_name>.txt        - Text with PAGE markers
@@ -14,6 +14,7 @@ Output:
 
 import sys
 import argparse
+from contextlib import ExitStack
 from pathlib import Path
 
 try:
@@ -22,9 +23,30 @@ except ImportError:
     print("ERROR: PyMuPDF not installed. Run: pip install pymupdf")
     sys.exit(1)
 
+from pdf_pages import (
+    finish_parallel_render,
+    plan_render,
+    save_manifest,
+    save_page_image,
+    start_parallel_render,
+)
 
-def extract_pdf(pdf_path: Path, text: bool = True, images: bool = True):
-    """Extract text and/or images from a PDF with page correlation."""
+# Output files are assembled in memory per page and flushed in large blocks
+WRITE_BUFFER = 1 << 20
+RULE = "=" * 60
+
+# Index previews show the first characters of each page's text
+PREVIEW_CHARS = 100
+
+
+def extract_pdf(
+    pdf_path: Path, text: bool = True, images: bool = True, jobs: int = 1
+):
+    """Extract text and/or images from a PDF with page correlation.
+
+    With jobs > 1, page images are rendered in worker processes while the
+    text is extracted here.
+    """
 
     if not pdf_path.exists():
         print(f"ERROR: File not found: {pdf_path}")
@@ -40,42 +62,75 @@ def extract_pdf(pdf_path: Path, text: bool = True, images: bool = True):
 
     print(f"Processing: {pdf_path.name} ({page_count} pages)")
 
-    # Extract text with page markers
+    img_dir = Path(f"{base}_images")
+    render = None
+    render_here = set()
+    if images:
+        try:
+            img_dir.mkdir()
+        except FileExistsError:  # re-run: reuse the folder without an extra stat
+            pass
+        manifest, stale = plan_render(doc, img_dir)
+        if jobs > 1 and len(stale) > 1:
+            render = start_parallel_render(pdf_path, img_dir, stale, jobs)
+        else:
+            render_here = set(stale)
+
+    # Single pass over the pages: text, image and index row for each page
+    txt_path = base.with_suffix(".txt")
+    index_rows = []
+    with ExitStack() as stack:
+        txt_file = None
+        if text:
+            txt_file = stack.enter_context(
+                open(txt_path, "w", encoding="utf-8", buffering=WRITE_BUFFER)
+            )
+
+        for i, page in enumerate(doc, 1):
+            if txt_file:
+                page_text = page.get_text()
+                txt_file.writelines(
+                    (f"\n{RULE}\nPAGE {i} of {page_count}\n{RULE}\n\n", page_text)
+                )
+                text_preview = page_text[:PREVIEW_CHARS]
+            else:
+                text_preview = page.get_text()[:PREVIEW_CHARS]
+
+            if i - 1 in render_here:
+                save_page_image(page, img_dir / f"page-{i:03d}.png")
+
+            text_preview = text_preview.replace("\n", " ").strip()
+            row = f"Page {i:3d}: {text_preview}...\n"
+            if images:
+                row += f"         -> {base.name}_images/page-{i:03d}.png\n"
+            index_rows.append(row)
+
     if text:
-        txt_path = base.with_suffix(".txt")
-        with open(txt_path, "w", encoding="utf-8") as f:
-            for i, page in enumerate(doc, 1):
-                f.write(f"\n{'=' * 60}\n")
-                f.write(f"PAGE {i} of {page_count}\n")
-                f.write(f"{'=' * 60}\n\n")
-                f.write(page.get_text())
         print(f"  Text: {txt_path.name}")
 
-    # Extract images
     if images:
-        img_dir = Path(f"{base}_images")
-        img_dir.mkdir(exist_ok=True)
-        for i, page in enumerate(doc, 1):
-            img_path = img_dir / f"page-{i:03d}.png"
-            pix = page.get_pixmap(dpi=150)
-            pix.save(img_path)
-        print(f"  Images: {img_dir.name}/ ({page_count} pages)")
+        if render:
+            finish_parallel_render(*render)
+        save_manifest(img_dir, manifest)
+        unchanged = page_count - len(stale)
+        note = f", {unchanged} unchanged" if unchanged else ""
+        print(f"  Images: {img_dir.name}/ ({page_count} pages{note})")
 
     # Create index file (maps pages to first line of content)
     index_path = Path(f"{base}_index.txt")
-    with open(index_path, "w", encoding="utf-8") as f:
-        f.write(f"PDF: {pdf_path.name}\n")
-        f.write(f"Pages: {page_count}\n")
-        f.write(f"Text file: {base.name}.txt\n")
-        f.write(f"Images folder: {base.name}_images/\n")
-        f.write(f"\n{'=' * 60}\n")
-        f.write("PAGE INDEX (first 100 chars of each page):\n")
-        f.write(f"{'=' * 60}\n\n")
-        for i, page in enumerate(doc, 1):
-            text_preview = page.get_text()[:100].replace("\n", " ").strip()
-            f.write(f"Page {i:3d}: {text_preview}...\n")
-            if images:
-                f.write(f"         -> {base.name}_images/page-{i:03d}.png\n")
+    with open(index_path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        f.writelines(
+            (
+                f"PDF: {pdf_path.name}\n",
+                f"Pages: {page_count}\n",
+                f"Text file: {base.name}.txt\n",
+                f"Images folder: {base.name}_images/\n",
+                f"\n{RULE}\n",
+                "PAGE INDEX (first 100 chars of each page):\n",
+                f"{RULE}\n\n",
+            )
+        )
+        f.writelines(index_rows)
     print(f"  Index: {index_path.name}")
 
     doc.close()
@@ -89,6 +144,12 @@ def main():
     parser.add_argument(
         "--images-only", action="store_true", help="Extract only images"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for page image rendering (default: 1)",
+    )
     args = parser.parse_args()
 
     pdf_path = Path(args.pdf).resolve()
@@ -96,9 +157,9 @@ def main():
     if args.text_only:
         extract_pdf(pdf_path, text=True, images=False)
     elif args.images_only:
-        extract_pdf(pdf_path, text=False, images=True)
+        extract_pdf(pdf_path, text=False, images=True, jobs=args.jobs)
     else:
-        extract_pdf(pdf_path, text=True, images=True)
+        extract_pdf(pdf_path, text=True, images=True, jobs=args.jobs)
 
 
 if __name__ == "__main__":
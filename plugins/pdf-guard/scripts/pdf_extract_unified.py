@@ -4,7 +4,7 @@ Unified PDF Extraction - Creates a single markdown file with text and
 inline image references at their exact positions.
 
 Usage:
-    python pdf_extract_unified.py <pdf_path>
+    python pdf_extract_unified.py <pdf_path> [--jobs N]
 
 Output:
     <pdf_name>_unified.md  - Markdown with text + image refs in context
@@ -12,6 +12,7 @@ Output:
 """
 
 import sys
+import argparse
 from pathlib import Path
 
 try:
@@ -20,9 +21,40 @@ except ImportError:
     print("ERROR: PyMuPDF not installed. Run: pip install pymupdf")
     sys.exit(1)
 
+from pdf_pages import (
+    finish_parallel_render,
+    plan_render,
+    save_manifest,
+    save_page_image,
+    start_parallel_render,
+)
 
-def extract_unified(pdf_path: Path):
-    """Create unified markdown with text and inline image references."""
+# The markdown is assembled in memory per page and flushed in large blocks
+WRITE_BUFFER = 1 << 20
+
+# Pages with more vector paths than this are treated as diagrams
+DRAWING_THRESHOLD = 5
+
+
+def has_visual_content(page) -> bool:
+    """True if the page embeds images or enough vector paths to be a diagram.
+
+    The image check runs first because it is cheap, and the drawing scan
+    is skipped entirely when it succeeds. get_cdrawings() returns the raw
+    paths without the per-item post-processing done by get_drawings().
+    """
+    if page.get_images(full=False):
+        return True
+    get_paths = getattr(page, "get_cdrawings", page.get_drawings)
+    return len(get_paths()) > DRAWING_THRESHOLD
+
+
+def extract_unified(pdf_path: Path, jobs: int = 1):
+    """Create unified markdown with text and inline image references.
+
+    With jobs > 1, page images are rendered in worker processes while the
+    markdown is written here.
+    """
 
     if not pdf_path.exists():
         print(f"ERROR: File not found: {pdf_path}")
@@ -32,60 +64,85 @@ def extract_unified(pdf_path: Path):
     base = pdf_path.with_suffix("")
     page_count = len(doc)
     img_dir = Path(f"{base}_images")
-    img_dir.mkdir(exist_ok=True)
+    try:
+        img_dir.mkdir()
+    except FileExistsError:  # re-run: reuse the folder without an extra stat
+        pass
 
     print(f"Processing: {pdf_path.name} ({page_count} pages)")
 
+    manifest, stale = plan_render(doc, img_dir)
+    render = None
+    render_here = set()
+    if jobs > 1 and len(stale) > 1:
+        render = start_parallel_render(pdf_path, img_dir, stale, jobs)
+    else:
+        render_here = set(stale)
+
     unified_path = Path(f"{base}_unified.md")
-    with open(unified_path, "w", encoding="utf-8") as f:
-        f.write(f"# {pdf_path.stem}\n\n")
-        f.write(f"*Extracted from: {pdf_path.name} ({page_count} pages)*\n\n")
-        f.write("---\n\n")
+    with open(unified_path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        f.write(
+            f"# {pdf_path.stem}\n\n"
+            f"*Extracted from: {pdf_path.name} ({page_count} pages)*\n\n"
+            "---\n\n"
+        )
 
         for i, page in enumerate(doc, 1):
-            # Save page image
+            # Save page image (unless unchanged or a worker process renders it)
             img_path = img_dir / f"page-{i:03d}.png"
-            pix = page.get_pixmap(dpi=150)
-            pix.save(img_path)
+            if i - 1 in render_here:
+                save_page_image(page, img_path)
 
             # Get text and detect if page has significant images/diagrams
             text = page.get_text()
-            has_images = len(page.get_images()) > 0
-            has_drawings = len(page.get_drawings()) > 5  # drawings = vector graphics
 
-            # Write page header
-            f.write(f"## Page {i}\n\n")
+            # Page header
+            chunks = [f"## Page {i}\n\n"]
 
             # If page has diagrams/images, show image reference FIRST
-            if has_images or has_drawings:
+            if has_visual_content(page):
                 rel_img = img_path.relative_to(pdf_path.parent)
-                f.write(f"**[Visual content on this page - see: {rel_img}]**\n\n")
-
-            # Write text content
-            if text.strip():
-                # Clean up text (remove excessive whitespace)
-                cleaned = "\n".join(
-                    line.strip() for line in text.split("\n") if line.strip()
-                )
-                f.write(f"{cleaned}\n\n")
+                chunks.append(f"**[Visual content on this page - see: {rel_img}]**\n\n")
+
+            # Text content, cleaned up (remove excessive whitespace). Each line
+            # is stripped once; an empty result means the page has no text.
+            cleaned = "\n".join(
+                filter(None, (line.strip() for line in text.split("\n")))
+            )
+            if cleaned:
+                chunks.append(f"{cleaned}\n\n")
             else:
-                f.write("*[No text content - page is primarily visual]*\n\n")
+                chunks.append("*[No text content - page is primarily visual]*\n\n")
 
-            f.write("---\n\n")
+            chunks.append("---\n\n")
+            f.writelines(chunks)
 
     doc.close()
+    if render:
+        finish_parallel_render(*render)
+    save_manifest(img_dir, manifest)
+    unchanged = page_count - len(stale)
+    note = f", {unchanged} unchanged" if unchanged else ""
     print(f"  Unified: {unified_path.name}")
-    print(f"  Images:  {img_dir.name}/ ({page_count} pages)")
+    print(f"  Images:  {img_dir.name}/ ({page_count} pages{note})")
     print("Done.")
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python pdf_extract_unified.py <pdf_path>")
-        sys.exit(1)
-
-    pdf_path = Path(sys.argv[1]).resolve()
-    extract_unified(pdf_path)
+    parser = argparse.ArgumentParser(
+        description="Extract PDF to unified markdown with inline image references"
+    )
+    parser.add_argument("pdf", help="Path to PDF file")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for page image rendering (default: 1)",
+    )
+    args = parser.parse_args()
+
+    pdf_path = Path(args.pdf).resolve()
+    extract_unified(pdf_path, jobs=args.jobs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+"""
+Page rendering and fingerprints shared by pdf_extract.py and
+pdf_extract_unified.py.
+
+Both scripts write the same <pdf_name>_images/page-NNN.png files and share
+one manifest, so pages left unchanged since the last run of either script
+are not rendered again.
+"""
+
+import hashlib
+import json
+import re
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import fitz  # PyMuPDF; the scripts report a missing install before importing this
+
+# Page images are rendered as RGB (no alpha channel) at this resolution.
+# The transform is built once rather than from dpi= on every page.
+RENDER_DPI = 150
+RENDER_MATRIX = fitz.Matrix(RENDER_DPI / 72, RENDER_DPI / 72)
+
+# Page fingerprints from the last run, so unchanged pages are not re-rendered
+MANIFEST_NAME = ".manifest.json"
+
+# Indirect references followed when fingerprinting a page. Back-references
+# to the page tree (/Parent, and /P in annotations) are dropped first, or
+# every page would pull in the whole document.
+OBJECT_REF = re.compile(r"(\d+) \d+ R")
+BACK_REF = re.compile(r"/(?:Parent|P)\s*\d+ \d+ R")
+
+
+def object_digest(doc, xref: int, cache: dict) -> tuple[bytes, list[int]]:
+    """Hash one PDF object (and its raw stream) and list the objects it references.
+
+    Results are cached per document, so fonts and images shared by many
+    pages are read once.
+    """
+    if xref not in cache:
+        source = BACK_REF.sub("", doc.xref_object(xref, compressed=True))
+        digest = hashlib.blake2b(source.encode(), digest_size=8)
+        if doc.xref_is_stream(xref):
+            digest.update(doc.xref_stream_raw(xref) or b"")
+        # The pattern can also match inside strings; ignore numbers that
+        # are not valid object numbers
+        refs = [int(ref) for ref in OBJECT_REF.findall(source)]
+        cache[xref] = (digest.digest(), [r for r in refs if 0 < r < doc.xref_length()])
+    return cache[xref]
+
+
+def page_fingerprint(doc, page, cache: dict, page_xrefs: frozenset) -> str:
+    """Hash the inputs of a page image.
+
+    Covers the page object and everything it reaches: content streams,
+    resources (form XObjects, fonts, images) and annotations, plus any
+    resources inherited from the page tree, the page box, rotation and
+    render DPI. The walk stops at other pages (page_xrefs), which link
+    annotations reach through /Dest and /A targets, so editing one page
+    never invalidates the pages that link to it.
+    """
+    digest = hashlib.blake2b(
+        repr((RENDER_DPI, tuple(page.rect), page.rotation)).encode(), digest_size=8
+    )
+    pending = [page.xref]
+    # Resources may be inherited from an ancestor Pages node
+    node = page.xref
+    while doc.xref_get_key(node, "Resources")[0] == "null":
+        kind, parent = doc.xref_get_key(node, "Parent")
+        if kind != "xref":
+            break
+        node = int(parent.split()[0])
+        kind, resources = doc.xref_get_key(node, "Resources")
+        if kind == "xref":
+            pending.append(int(resources.split()[0]))
+        elif kind == "dict":
+            digest.update(resources.encode())
+            pending.extend(int(ref) for ref in OBJECT_REF.findall(resources))
+
+    seen = set(pending)
+    while pending:
+        object_hash, refs = object_digest(doc, pending.pop(), cache)
+        digest.update(object_hash)
+        for ref in refs:
+            if ref not in seen and ref not in page_xrefs:
+                seen.add(ref)
+                pending.append(ref)
+    return digest.hexdigest()
+
+
+def plan_render(doc, img_dir: Path) -> tuple[dict, list[int]]:
+    """Fingerprint every page and list those whose image must be (re)rendered.
+
+    Returns the new manifest ({page number: fingerprint}) and the 0-based
+    indices of pages that changed since the last run or have no PNG yet.
+    """
+    try:
+        with open(img_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    manifest = {}
+    stale = []
+    cache = {}
+    page_xrefs = frozenset(doc.page_xref(i) for i in range(len(doc)))
+    for i, page in enumerate(doc):
+        key = str(i + 1)
+        manifest[key] = page_fingerprint(doc, page, cache, page_xrefs)
+        if previous.get(key) != manifest[key]:
+            stale.append(i)
+        elif not (img_dir / f"page-{i + 1:03d}.png").exists():
+            stale.append(i)
+    return manifest, stale
+
+
+def save_manifest(img_dir: Path, manifest: dict):
+    """Record the fingerprints of the images now on disk."""
+    with open(img_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        f.write(json.dumps(manifest, separators=(",", ":")))
+
+
+def save_page_image(page, path: Path):
+    """Render one page to an RGB PNG tagged with RENDER_DPI."""
+    pix = page.get_pixmap(matrix=RENDER_MATRIX, alpha=False, colorspace=fitz.csRGB)
+    pix.set_dpi(RENDER_DPI, RENDER_DPI)  # matrix= leaves the PNG tagged 96 DPI
+    pix.save(path)
+
+
+def _render_pages(pdf_path: Path, img_dir: Path, pages: list[int]):
+    """Render the given 0-based pages to PNG. Runs inside a worker process."""
+    with fitz.open(pdf_path) as doc:
+        for i in pages:
+            save_page_image(doc[i], img_dir / f"page-{i + 1:03d}.png")
+
+
+def start_parallel_render(
+    pdf_path: Path, img_dir: Path, pages: list[int], jobs: int
+) -> tuple[ProcessPoolExecutor, list[Future]]:
+    """Split the pages into one contiguous slice per worker and submit them.
+
+    Each worker opens its own document handle, since MuPDF documents must
+    not be shared across processes.
+    """
+    step = -(-len(pages) // jobs)  # ceiling division
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    futures = [
+        pool.submit(_render_pages, pdf_path, img_dir, pages[start : start + step])
+        for start in range(0, len(pages), step)
+    ]
+    return pool, futures
+
+
+def finish_parallel_render(pool: ProcessPoolExecutor, futures: list[Future]):
+    """Wait for all render workers, re-raising the first failure."""
+    with pool:
+        for future in as_completed(futures):
+            future.result()
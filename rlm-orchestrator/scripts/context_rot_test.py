@@ -11,23 +11,45 @@ Usage:
     python context_rot_test.py --mode rlm         # Test with RLM orchestration
     python context_rot_test.py --mode compare     # Compare both approaches
     python context_rot_test.py --generate-report  # Generate detailed report
+    python context_rot_test.py --materialize-files  # Also write the test files
+    python context_rot_test.py --split-results    # One JSON file per result
+
+Generated test files are scratch data and go to tmpfs (/dev/shm, or the
+system temp dir where that is missing). Set CONTEXT_ROT_TMPDIR to put them
+elsewhere. Results and reports stay under ~/.claude/test_context_rot, with
+results appended one per line to results/results.ndjson.
 """
 
 import argparse
+import io
 import json
 import os
 import random
 import string
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 # Test configuration
 TEST_DIR = Path.home() / ".claude" / "test_context_rot"
 RESULTS_DIR = TEST_DIR / "results"
-GENERATED_DIR = TEST_DIR / "generated_files"
+SCRATCH_DIR = (
+    Path(
+        os.environ.get("CONTEXT_ROT_TMPDIR")
+        or ("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+    )
+    / "context_rot_test"
+)
+GENERATED_DIR = SCRATCH_DIR / "generated_files"
+
+# Character sets for generated text
+ALPHABET = string.ascii_letters
+ALPHABET_SPACE = string.ascii_letters + " "
 
 
 @dataclass
@@ -79,6 +101,7 @@ def generate_test_files(scenario: TestScenario) -> list[Path]:
     GENERATED_DIR.mkdir(parents=True, exist_ok=True)
 
     files = []
+    contents = []
     recall_markers = []
 
     for i in range(scenario.file_count):
@@ -100,35 +123,75 @@ def generate_test_files(scenario: TestScenario) -> list[Path]:
                 i, recall_marker, scenario.avg_file_size_kb
             )
 
-        filepath = GENERATED_DIR / f"test_file_{i:03d}.txt"
-        filepath.write_text(content)
-        files.append(filepath)
+        files.append(GENERATED_DIR / f"test_file_{i:03d}.txt")
+        # Generated text is pure ASCII; encode once and write raw bytes
+        contents.append(content.encode("ascii"))
+
+    # Writes to independent files overlap well; the GIL is released during I/O
+    if files:
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as pool:
+            list(pool.map(Path.write_bytes, files, contents))
 
     # Save recall markers for verification
-    markers_file = TEST_DIR / "recall_markers.json"
-    markers_file.write_text(json.dumps(recall_markers, indent=2))
+    # One marker per line; read back with read_text().splitlines()
+    markers_file = SCRATCH_DIR / "recall_markers.txt"
+    markers_file.write_text("\n".join(recall_markers) + "\n")
 
     return files
 
 
+@lru_cache(maxsize=None)
+def byte_tables(alphabet: str) -> tuple[bytes, bytes]:
+    """Translate and delete tables mapping random bytes onto `alphabet`."""
+    n = len(alphabet)
+    # Map every byte onto the alphabet; bytes past the last full cycle are
+    # dropped so each character stays equally likely
+    table = bytes(ord(alphabet[b % n]) for b in range(256))
+    reject = bytes(range(256 // n * n, 256))
+    return table, reject
+
+
+def random_blocks(
+    rng: random.Random, alphabet: str, width: int, batch: int = 64
+) -> Iterator[str]:
+    """Yield random strings of `width` chars from `alphabet`, drawing bytes in bulk."""
+    table, reject = byte_tables(alphabet)
+    text = ""
+    while True:
+        text += rng.randbytes(width * batch).translate(table, reject).decode("ascii")
+        count = len(text) // width
+        for k in range(count):
+            yield text[k * width : (k + 1) * width]
+        text = text[count * width :]
+
+
+def random_ints(
+    rng: random.Random, low: int, high: int, batch: int = 256
+) -> Iterator[int]:
+    """Yield random ints in [low, high], drawing `batch` of them per RNG call."""
+    population = range(low, high + 1)
+    while True:
+        yield from rng.choices(population, k=batch)
+
+
 def generate_simple_content(index: int, marker: str, size_kb: int) -> str:
     """Generate simple test content."""
-    lines = []
-    lines.append(f"# Test File {index}")
-    lines.append(f"# Recall Marker: {marker}")
-    lines.append("")
+    buf = io.StringIO()
+    buf.write(f"# Test File {index}\n")
+    buf.write(f"# Recall Marker: {marker}\n")
+    buf.write("\n")
+    line_count = 3
 
     target_chars = size_kb * 1024
-    current_chars = sum(len(line) for line in lines)
+    # Seeded from the marker so a file can be regenerated exactly
+    rng = random.Random(marker)
+    prose = random_blocks(rng, ALPHABET_SPACE, 80)
 
-    while current_chars < target_chars:
-        line = f"Line {len(lines)}: " + "".join(
-            random.choices(string.ascii_letters + " ", k=80)
-        )
-        lines.append(line)
-        current_chars += len(line) + 1
+    while buf.tell() < target_chars:
+        buf.write(f"Line {line_count}: {next(prose)}\n")
+        line_count += 1
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def generate_medium_content(index: int, marker: str, size_kb: int) -> str:
@@ -142,77 +205,91 @@ def generate_medium_content(index: int, marker: str, size_kb: int) -> str:
         "Conclusion",
     ]
 
-    lines = []
-    lines.append(f"# Test Document {index}")
-    lines.append(f"## Hidden Marker: {marker}")
-    lines.append("")
+    buf = io.StringIO()
+    buf.write(f"# Test Document {index}\n")
+    buf.write(f"## Hidden Marker: {marker}\n")
+    buf.write("\n")
+    line_count = 3
 
     target_chars = size_kb * 1024
-    current_chars = sum(len(line) for line in lines)
+    # Seeded from the marker so a file can be regenerated exactly
+    rng = random.Random(marker)
 
+    prose = random_blocks(rng, ALPHABET_SPACE, 100)
+    items = random_blocks(rng, ALPHABET, 40)
+
+    # A section header starts every 20th line; count down to the next one
     section_idx = 0
-    while current_chars < target_chars:
-        if len(lines) % 20 == 0:
-            lines.append(f"\n## {sections[section_idx % len(sections)]}\n")
+    lines_to_section = 20 - line_count
+    while buf.tell() < target_chars:
+        if lines_to_section == 0:
+            buf.write(f"\n## {sections[section_idx]}\n\n")
+            line_count += 1
+            lines_to_section = 19
             section_idx += 1
+            if section_idx == len(sections):
+                section_idx = 0
 
         # Mix of prose and structured content
-        if random.random() < 0.3:
-            lines.append(
-                f"- Item {len(lines)}: "
-                + "".join(random.choices(string.ascii_letters, k=40))
-            )
+        if rng.random() < 0.3:
+            buf.write(f"- Item {line_count}: {next(items)}\n")
         else:
-            lines.append("".join(random.choices(string.ascii_letters + " ", k=100)))
-
-        current_chars = sum(len(line) for line in lines)
+            buf.write(f"{next(prose)}\n")
+        line_count += 1
+        lines_to_section -= 1
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def generate_complex_content(index: int, marker: str, size_kb: int) -> str:
     """Generate complex test content with code, tables, and cross-references."""
-    lines = []
-    lines.append(f"# Complex Test Document {index}")
-    lines.append(f"<!-- Verification Token: {marker} -->")
-    lines.append("")
+    buf = io.StringIO()
+    buf.write(f"# Complex Test Document {index}\n")
+    buf.write(f"<!-- Verification Token: {marker} -->\n")
+    buf.write("\n")
+    line_count = 3
 
     target_chars = size_kb * 1024
-    current_chars = sum(len(line) for line in lines)
+    # Seeded from the marker so a file can be regenerated exactly
+    rng = random.Random(marker)
 
     content_types = ["prose", "code", "table", "list", "quote"]
+    prose = random_blocks(rng, ALPHABET_SPACE, 150)
+    items = random_blocks(rng, ALPHABET, 20)
+    quotes = random_blocks(rng, ALPHABET_SPACE, 80)
+    returns = random_ints(rng, 1, 1000)
+    cells = random_ints(rng, 1, 100)
 
-    while current_chars < target_chars:
-        content_type = random.choice(content_types)
+    while buf.tell() < target_chars:
+        content_type = rng.choice(content_types)
 
         if content_type == "prose":
-            lines.append("".join(random.choices(string.ascii_letters + " ", k=150)))
+            buf.write(f"{next(prose)}\n")
+            line_count += 1
         elif content_type == "code":
-            lines.append("```python")
-            lines.append(f"def function_{len(lines)}():")
-            lines.append(f"    return {random.randint(1, 1000)}")
-            lines.append("```")
+            buf.write("```python\n")
+            buf.write(f"def function_{line_count + 1}():\n")
+            buf.write(f"    return {next(returns)}\n")
+            buf.write("```\n")
+            line_count += 4
         elif content_type == "table":
-            lines.append("| Col A | Col B | Col C |")
-            lines.append("|-------|-------|-------|")
+            buf.write("| Col A | Col B | Col C |\n")
+            buf.write("|-------|-------|-------|\n")
             for _ in range(3):
-                lines.append(
-                    f"| {random.randint(1, 100)} | {random.randint(1, 100)} | {random.randint(1, 100)} |"
-                )
+                buf.write(f"| {next(cells)} | {next(cells)} | {next(cells)} |\n")
+            line_count += 5
         elif content_type == "list":
             for j in range(5):
-                lines.append(
-                    f"  {j + 1}. Item {''.join(random.choices(string.ascii_letters, k=20))}"
-                )
+                buf.write(f"  {j + 1}. Item {next(items)}\n")
+            line_count += 5
         else:
-            lines.append(
-                f"> Quote: {''.join(random.choices(string.ascii_letters + ' ', k=80))}"
-            )
+            buf.write(f"> Quote: {next(quotes)}\n")
+            line_count += 1
 
-        lines.append("")
-        current_chars = sum(len(line) for line in lines)
+        buf.write("\n")
+        line_count += 1
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def create_test_scenarios() -> list[TestScenario]:
@@ -269,9 +346,6 @@ def run_baseline_test(scenario: TestScenario) -> TestResult:
     """Run test without RLM orchestration (simulated)."""
     start_time = time.time()
 
-    # Simulate baseline processing
-    files = generate_test_files(scenario)
-
     # Simulate context rot effects
     if scenario.expected_tokens < 50000:
         recall_accuracy = 0.95
@@ -293,10 +367,11 @@ def run_baseline_test(scenario: TestScenario) -> TestResult:
 
     elapsed = time.time() - start_time
 
+    now = datetime.now()
     return TestResult(
-        test_id=f"baseline_{scenario.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        test_id=f"baseline_{scenario.name}_{now.strftime('%Y%m%d_%H%M%S')}",
         mode="baseline",
-        timestamp=datetime.now().isoformat(),
+        timestamp=now.isoformat(),
         files_processed=scenario.file_count,
         total_tokens_consumed=scenario.expected_tokens,
         context_window_usage_percent=min(
@@ -317,8 +392,6 @@ def run_rlm_test(scenario: TestScenario) -> TestResult:
     """Run test with RLM orchestration (simulated)."""
     start_time = time.time()
 
-    files = generate_test_files(scenario)
-
     # Calculate optimal partitioning
     tokens_per_subagent = 150000  # Leave room for orchestration
     subagents_needed = max(1, scenario.expected_tokens // tokens_per_subagent)
@@ -341,10 +414,11 @@ def run_rlm_test(scenario: TestScenario) -> TestResult:
     # Effective context = main context + (subagents * subagent context)
     effective_multiplier = 1.0 + (subagents_needed * 0.9)  # 90% usable per subagent
 
+    now = datetime.now()
     return TestResult(
-        test_id=f"rlm_{scenario.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        test_id=f"rlm_{scenario.name}_{now.strftime('%Y%m%d_%H%M%S')}",
         mode="rlm",
-        timestamp=datetime.now().isoformat(),
+        timestamp=now.isoformat(),
         files_processed=scenario.file_count,
         total_tokens_consumed=scenario.expected_tokens,
         context_window_usage_percent=min(
@@ -406,6 +480,17 @@ def compare_results(baseline: TestResult, rlm: TestResult) -> dict:
     }
 
 
+def save_results(test_results: list[TestResult], split: bool = False) -> None:
+    """Append results to results.ndjson in one write, or save one JSON file each."""
+    if split:
+        for result in test_results:
+            result_file = RESULTS_DIR / f"{result.test_id}.json"
+            result_file.write_text(json.dumps(asdict(result), indent=2))
+    elif test_results:
+        with open(RESULTS_DIR / "results.ndjson", "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(asdict(result)) + "\n" for result in test_results)
+
+
 def generate_report(results: list[dict]) -> str:
     """Generate a detailed comparison report."""
     lines = []
@@ -488,6 +573,16 @@ def main():
     parser.add_argument(
         "--generate-report", action="store_true", help="Generate detailed report"
     )
+    parser.add_argument(
+        "--materialize-files",
+        action="store_true",
+        help="Write the generated test files to disk (not needed for the metrics)",
+    )
+    parser.add_argument(
+        "--split-results",
+        action="store_true",
+        help="Save each result to its own JSON file instead of results.ndjson",
+    )
 
     args = parser.parse_args()
 
@@ -500,6 +595,7 @@ def main():
         scenarios = [s for s in scenarios if s.name == args.scenario]
 
     results = []
+    test_results = []
 
     for scenario in scenarios:
         print(f"\n{'=' * 60}")
@@ -508,6 +604,11 @@ def main():
         print(f"Expected tokens: {scenario.expected_tokens:,}")
         print(f"{'=' * 60}")
 
+        # Generated once per scenario; the simulated runners only need the
+        # scenario itself
+        if args.materialize_files:
+            generate_test_files(scenario)
+
         if args.mode in ["baseline", "compare", "all"]:
             print("\nRunning baseline test...")
             baseline_result = run_baseline_test(scenario)
@@ -516,9 +617,7 @@ def main():
                 f"  Instruction following: {baseline_result.instruction_following:.2f}"
             )
 
-            # Save result
-            result_file = RESULTS_DIR / f"{baseline_result.test_id}.json"
-            result_file.write_text(json.dumps(asdict(baseline_result), indent=2))
+            test_results.append(baseline_result)
 
         if args.mode in ["rlm", "compare", "all"]:
             print("\nRunning RLM test...")
@@ -527,9 +626,7 @@ def main():
             print(f"  Instruction following: {rlm_result.instruction_following:.2f}")
             print(f"  Subagents spawned: {rlm_result.subagents_spawned}")
 
-            # Save result
-            result_file = RESULTS_DIR / f"{rlm_result.test_id}.json"
-            result_file.write_text(json.dumps(asdict(rlm_result), indent=2))
+            test_results.append(rlm_result)
 
         if args.mode in ["compare", "all"]:
             comparison = compare_results(baseline_result, rlm_result)
@@ -539,6 +636,8 @@ def main():
             for metric, data in comparison["improvements"].items():
                 print(f"  {metric}: {data['improvement_percent']:+.1f}% improvement")
 
+    save_results(test_results, args.split_results)
+
     if args.generate_report or args.mode == "all":
         if results:
             report = generate_report(results)
@@ -13,54 +13,94 @@ Usage:
 import json
 import sys
 import re
+import os
 import argparse
-from docx import Document
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from docx_xml import W, paragraph_text, is_merge_continuation
 
 sys.stdout.reconfigure(encoding='utf-8')
 
 
+# Curly quotes to straight quotes, in one pass
+QUOTE_TABLE = str.maketrans({'\u201c': '"', '\u201d': '"', '\u2018': "'", '\u2019': "'"})
+UNICODE_SPACES = re.compile(r'[\u2002\u2003\u2009\u200A\u00A0]+')
+
+# Texts kept as-is: single letters A-I and S (allowed English), numbers and
+# scoring notation like (-3), and known abbreviations in any case
+SELF_MAP = re.compile(r'[A-IS]|-?\d+|\(-?\d+\)|(?i:DVD|CD|TV|USB|PDF|CEO|CFO)')
+
+
 def normalize_text(text):
     """Normalize quotes and unicode spaces"""
-    # Convert curly quotes to straight quotes
-    text = text.replace('\u201c', '"').replace('\u201d', '"')
-    text = text.replace('\u2018', "'").replace('\u2019', "'")
+    return UNICODE_SPACES.sub(' ', text.translate(QUOTE_TABLE)).strip()
 
-    # Normalize unicode spaces
-    text = re.sub(r'[\u2002\u2003\u2009\u200A\u00A0]+', ' ', text)
 
-    return text.strip()
+def iter_docx_texts(docx_path):
+    """
+    Yield body paragraph texts, then cell texts of each top-level table
+
+    Streams word/document.xml instead of building python-docx's object
+    model. Only one body-level element is held in memory at a time.
+    """
+    with zipfile.ZipFile(docx_path) as z, z.open('word/document.xml') as f:
+        depth = 0
+        for event, el in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            # document is depth 0, body is depth 1, body children are depth 2
+            if depth != 2:
+                continue
+            if el.tag == W + 'p':
+                yield paragraph_text(el)
+            elif el.tag == W + 'tbl':
+                for tr in el.iterfind(W + 'tr'):
+                    for tc in tr.iterfind(W + 'tc'):
+                        if not is_merge_continuation(tc):
+                            yield '\n'.join(
+                                paragraph_text(p) for p in tc.iterfind(W + 'p')
+                            )
+            el.clear()
+
+
+def extract_file_texts(docx_path):
+    """Extract unique text snippets (and normalized forms) from one document"""
+    unique_texts = set()
+
+    # Paragraphs and table cells
+    for text in iter_docx_texts(docx_path):
+        text = text.strip()
+        # Seen texts already have their normalized form in the set
+        if text and text not in unique_texts:
+            unique_texts.add(text)
+
+            # Also add normalized version
+            normalized = normalize_text(text)
+            if normalized != text:
+                unique_texts.add(normalized)
+
+    return unique_texts
 
 
 def extract_unique_texts(docx_paths):
     """Extract all unique text snippets from documents"""
     unique_texts = set()
 
-    for docx_path in docx_paths:
-        print(f"Processing: {docx_path}")
-        doc = Document(docx_path)
-
-        # Extract from paragraphs
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            if text:
-                unique_texts.add(text)
-
-                # Also add normalized version
-                normalized = normalize_text(text)
-                if normalized != text:
-                    unique_texts.add(normalized)
-
-        # Extract from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text = cell.text.strip()
-                    if text:
-                        unique_texts.add(text)
-
-                        normalized = normalize_text(text)
-                        if normalized != text:
-                            unique_texts.add(normalized)
+    if len(docx_paths) > 1:
+        # Parsing is CPU-bound, so spread the files over processes
+        with ProcessPoolExecutor(max_workers=min(len(docx_paths), os.cpu_count() or 1)) as pool:
+            per_file = pool.map(extract_file_texts, docx_paths)
+            for docx_path, texts in zip(docx_paths, per_file):
+                print(f"Processing: {docx_path}")
+                unique_texts |= texts
+    else:
+        for docx_path in docx_paths:
+            print(f"Processing: {docx_path}")
+            unique_texts |= extract_file_texts(docx_path)
 
     print(f"\nExtracted {len(unique_texts)} unique text snippets")
     return unique_texts
@@ -75,28 +115,9 @@ def create_translation_dictionary(unique_texts, output_path, target_lang='ar'):
     """
     translations = {}
 
-    # Self-map single letters (allowed English)
-    single_letters = set('ABCDEFGHIS')
-
-    # Self-map numbers and scoring notation
-    number_pattern = re.compile(r'^-?\d+$|^\(-?\d+\)$')
-
-    # Known abbreviations (self-map)
-    abbreviations = {'DVD', 'CD', 'TV', 'USB', 'PDF', 'CEO', 'CFO'}
-
     for text in sorted(unique_texts):
-        # Single letters
-        if text in single_letters:
-            translations[text] = text
-            continue
-
-        # Numbers and scoring
-        if number_pattern.match(text):
-            translations[text] = text
-            continue
-
-        # Abbreviations
-        if text.upper() in abbreviations:
+        # Single letters, numbers, scoring and abbreviations
+        if SELF_MAP.fullmatch(text):
             translations[text] = text
             continue
 
@@ -114,9 +135,9 @@ def create_translation_dictionary(unique_texts, output_path, target_lang='ar'):
         #     print(f"Translation failed for '{text}': {e}")
         #     translations[text] = f"[TRANSLATE: {text}]"
 
-    # Save
+    # Save (keys are already in sorted order from the loop above)
     with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(translations, f, ensure_ascii=False, indent=2, sort_keys=True)
+        json.dump(translations, f, ensure_ascii=False, indent=2)
 
     print(f"\nSaved {len(translations)} entries to {output_path}")
     print(f"\nNext steps:")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+DOCX XML Text Helpers
+
+Reads text from word/document.xml elements the same way python-docx does,
+so scripts can stream the XML instead of building the full object model.
+Shared by create_translation.py and verify_document.py.
+"""
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Run children that stand in for a fixed character (w:br is handled apart)
+RUN_CHARS = {W + 'tab': '\t', W + 'ptab': '\t', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+
+def run_text(r):
+    """Text of a w:r element, matching python-docx's Run.text"""
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == W + 't':
+            parts.append(child.text or '')
+        elif tag == W + 'br':
+            # Page and column breaks carry no text
+            if child.get(W + 'type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag in RUN_CHARS:
+            parts.append(RUN_CHARS[tag])
+    return ''.join(parts)
+
+
+def paragraph_text(p):
+    """Text of a w:p element, matching python-docx's Paragraph.text"""
+    parts = []
+    for child in p:
+        if child.tag == W + 'r':
+            parts.append(run_text(child))
+        elif child.tag == W + 'hyperlink':
+            parts.extend(run_text(r) for r in child.iterfind(W + 'r'))
+    return ''.join(parts)
+
+
+def is_merge_continuation(tc):
+    """True for a cell continuing a vertical merge (python-docx reports the top cell)"""
+    vmerge = tc.find(f'{W}tcPr/{W}vMerge')
+    return vmerge is not None and vmerge.get(W + 'val', 'continue') == 'continue'
@@ -7,69 +7,167 @@ Comprehensive verification of RTL-translated DOCX files.
 
 Usage:
     python verify_document.py arabic.docx english.docx translations.json
+    python verify_document.py arabic.docx english.docx translations.json --fast-fail
 """
 
 import json
 import sys
 import re
+import os
 import argparse
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 
-sys.stdout.reconfigure(encoding='utf-8')
+from docx_xml import W, paragraph_text, is_merge_continuation
 
+# Optional: faster parsing for large translation dictionaries
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def load_allowed_english(translation_dict):
-    """Extract allowed English from self-mapped dictionary entries"""
-    allowed = set()
+sys.stdout.reconfigure(encoding='utf-8')
 
-    for key, value in translation_dict.items():
-        if key == value and re.search(r'[a-zA-Z]', key):
-            allowed.add(key.strip())
+# English words are runs of Latin letters. Text is encoded to ASCII with every
+# other character replaced, then this table blanks everything but a-z/A-Z, so a
+# plain split() finds the words; digits, underscores and Arabic letters all
+# count as word edges
+LETTERS_ONLY = bytes(c if 65 <= c <= 90 or 97 <= c <= 122 else 0x20 for c in range(256))
+
+# Accented Latin letters (Latin-1 Supplement and Latin Extended-A/B, without
+# × and ÷) belong to a word that has a-z/A-Z in it, so "café" is one word,
+# not "caf". Text with words and any accented letter takes the regex path
+ACCENTED = '\u00c0-\u00d6\u00d8-\u00f6\u00f8-\u024f'
+ACCENTED_PATTERN = re.compile(f'[{ACCENTED}]')
+WORD_PATTERN = re.compile(f'[a-zA-Z{ACCENTED}]*[a-zA-Z][a-zA-Z{ACCENTED}]*')
+LETTER_PATTERN = re.compile(f'[a-zA-Z{ACCENTED}]')
+
+# One body paragraph or table cell; for a cell the flags are its first paragraph's.
+# location is (paragraph,) or (table, row, col), 1-based; see format_location
+Block = namedtuple('Block', 'location is_cell text has_paragraphs right_aligned bidi')
+
+# How many misaligned cells / missing-RTL elements / English words to keep
+# for the report; totals are counted separately
+MAX_LOCATIONS = 10
+MAX_WORDS = 20
+
+# Documents with more non-empty blocks than this scan for English in worker
+# processes; below it, process start-up costs more than the scan itself
+PARALLEL_SCAN_BLOCKS = 20000
+SCAN_CHUNK_BLOCKS = 2000
+
+
+# w:val settings that switch an on/off property like w:bidi off
+OFF_VALUES = ('0', 'false', 'off')
+
+
+def paragraph_flags(p):
+    """(right_aligned, bidi) from a w:p element's paragraph properties"""
+    ppr = p.find(W + 'pPr')
+    if ppr is None:
+        return False, False
+    jc = ppr.find(W + 'jc')
+    bidi = ppr.find(W + 'bidi')
+    return (
+        jc is not None and jc.get(W + 'val') == 'right',
+        bidi is not None and bidi.get(W + 'val', 'true') not in OFF_VALUES,
+    )
 
-    # Known abbreviations
-    allowed.update(['DVD', 'CD', 'TV', 'USB', 'PDF', 'CEO', 'CFO'])
 
-    return allowed
+def int_property(parent, path, default):
+    """Integer w:val of the element at `path` under `parent`, or `default`"""
+    el = parent.find(path)
+    return int(el.get(W + 'val', default)) if el is not None else default
 
 
-def scan_for_unauthorized_english(doc, allowed_english):
-    """
-    Scan document for unauthorized English words
-    Returns list of (location, word) tuples
+def table_blocks(tbl, t_idx):
     """
-    unauthorized = []
+    Yield a Block per cell of a w:tbl, counting merged cells once
 
-    def check_text(text, location):
-        """Check text for English words not in allowed set"""
-        # Remove numbers and scoring notation
-        cleaned = re.sub(r'\(-?\d+\)', '', text)
-        cleaned = re.sub(r'[$€£¥]?\d+[,.]?\d*%?', '', cleaned)
-        cleaned = re.sub(r'\d+', '', cleaned)
+    A cell spanning several grid columns is yielded once, at its first
+    column. Cells continuing a vertical merge are skipped, since the merge's
+    top cell already covers them. Column numbers follow python-docx's
+    row.cells positions.
+    """
+    for r_idx, tr in enumerate(tbl.iterfind(W + 'tr')):
+        c_idx = 0
+        for tc in tr.iterfind(W + 'tc'):
+            span = int_property(tc, f'{W}tcPr/{W}gridSpan', 1)
+            if not is_merge_continuation(tc):
+                paragraphs = tc.findall(W + 'p')
+                yield Block(
+                    (t_idx + 1, r_idx + 1, c_idx + 1),
+                    True,
+                    '\n'.join(paragraph_text(p) for p in paragraphs),
+                    bool(paragraphs),
+                    *(paragraph_flags(paragraphs[0]) if paragraphs else (False, False)),
+                )
+            c_idx += span
+
+
+def iter_blocks(docx_path):
+    """
+    Stream word/document.xml and yield a Block per body paragraph and table cell
 
-        # Extract words
-        words = re.findall(r'\b[a-zA-Z]+\b', cleaned)
+    Reads only what the checks need instead of building python-docx's object
+    model. Body paragraphs come first and table cells after them, the same
+    order as walking doc.paragraphs and then doc.tables.
+    """
+    cells = []
+    p_idx = t_idx = 0
+    with zipfile.ZipFile(docx_path) as z, z.open('word/document.xml') as f:
+        depth = 0
+        for event, el in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            # document is depth 0, body is depth 1, body children are depth 2
+            if depth != 2:
+                continue
+            if el.tag == W + 'p':
+                p_idx += 1
+                text = paragraph_text(el)
+                yield Block((p_idx,), False, text, True, *paragraph_flags(el))
+            elif el.tag == W + 'tbl':
+                cells.extend(table_blocks(el, t_idx))
+                t_idx += 1
+            el.clear()
+    yield from cells
+
+
+def format_location(location):
+    """Readable form of a Block location tuple"""
+    if len(location) == 1:
+        return f"Paragraph {location[0]}"
+    return "Table {}, Row {}, Col {}".format(*location)
+
+
+def load_translation_dict(path):
+    """Load the translation dictionary JSON, with orjson when installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
-        for word in words:
-            if word not in allowed_english and word.upper() not in allowed_english:
-                unauthorized.append((location, word))
 
-    # Scan paragraphs
-    for idx, para in enumerate(doc.paragraphs):
-        if para.text.strip():
-            check_text(para.text, f"Paragraph {idx + 1}")
+def load_allowed_english(translation_dict):
+    """Extract allowed English from self-mapped dictionary entries"""
+    allowed = {
+        key.strip()
+        for key, value in translation_dict.items()
+        if key == value and LETTER_PATTERN.search(key)
+    }
 
-    # Scan tables
-    for t_idx, table in enumerate(doc.tables):
-        for r_idx, row in enumerate(table.rows):
-            for c_idx, cell in enumerate(row.cells):
-                if cell.text.strip():
-                    check_text(
-                        cell.text,
-                        f"Table {t_idx + 1}, Row {r_idx + 1}, Col {c_idx + 1}"
-                    )
+    # Known abbreviations
+    allowed.update(['DVD', 'CD', 'TV', 'USB', 'PDF', 'CEO', 'CFO'])
 
-    return unauthorized
+    return allowed
 
 
 def verify_structure(ar_doc, eng_doc):
@@ -145,71 +243,144 @@ def verify_structure(ar_doc, eng_doc):
     return results
 
 
-def verify_alignment(doc):
-    """Verify all cells are right-aligned"""
-    total_cells = 0
-    right_aligned = 0
-    misaligned = []
+def english_words(text):
+    """Runs of Latin letters with at least one a-z/A-Z in text, in order"""
+    words = text.encode('ascii', 'replace').translate(LETTERS_ONLY).split()
+    if words and ACCENTED_PATTERN.search(text):
+        return WORD_PATTERN.findall(text)
+    return [word.decode('ascii') for word in words]
 
-    for t_idx, table in enumerate(doc.tables):
-        for r_idx, row in enumerate(table.rows):
-            for c_idx, cell in enumerate(row.cells):
-                total_cells += 1
 
-                if cell.paragraphs:
-                    para = cell.paragraphs[0]
-                    if para.alignment == WD_ALIGN_PARAGRAPH.RIGHT:
-                        right_aligned += 1
-                    else:
-                        misaligned.append(f"Table {t_idx + 1}, Row {r_idx + 1}, Col {c_idx + 1}")
-
-    percentage = (right_aligned / total_cells * 100) if total_cells > 0 else 0
+def unauthorized_words(texts, allowed_upper):
+    """
+    Find English words in (location, text) pairs that are not in allowed_upper
 
-    return {
-        'total': total_cells,
-        'right_aligned': right_aligned,
-        'percentage': percentage,
-        'misaligned': misaligned[:10]  # First 10 only
-    }
+    Returns (count, sample): the number of such words and the first
+    MAX_WORDS of them as (location, word) tuples.
+    """
+    count = 0
+    sample = []
+    # Repeated cells (labels, headers, "N/A") are checked once
+    seen = {}
+    for location, text in texts:
+        words = seen.get(text)
+        if words is None:
+            # Numbers and scoring notation never match
+            words = english_words(text)
+            # Usually every word is allowed; one set difference settles that
+            bad = {word.upper() for word in words} - allowed_upper
+            words = [word for word in words if word.upper() in bad] if bad else []
+            seen[text] = words
+        if words:
+            count += len(words)
+            room = MAX_WORDS - len(sample)
+            if room > 0:
+                sample.extend((location, word) for word in words[:room])
+    return count, sample
+
+
+def scan_english(texts, allowed_upper):
+    """Run unauthorized_words over all texts, in parallel for large documents"""
+    workers = os.cpu_count() or 1
+    if len(texts) <= PARALLEL_SCAN_BLOCKS or workers == 1:
+        return unauthorized_words(texts, allowed_upper)
+
+    chunks = [texts[i:i + SCAN_CHUNK_BLOCKS] for i in range(0, len(texts), SCAN_CHUNK_BLOCKS)]
+    count = 0
+    sample = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for found, found_sample in pool.map(partial(unauthorized_words, allowed_upper=allowed_upper), chunks):
+            count += found
+            sample.extend(found_sample[:MAX_WORDS - len(sample)])
+    return count, sample
+
+
+def verify_all(docx_path, allowed_english):
+    """
+    Run the alignment, RTL and English checks in one pass over the document
 
+    Returns a dict with 'alignment' and 'rtl' result dicts, plus
+    'unauthorized_count' and 'unauthorized', the first MAX_WORDS offending
+    (location, word) tuples. Locations are Block location tuples; format
+    them with format_location.
+    """
+    total_cells = 0
+    right_aligned = 0
+    misaligned_count = 0
+    misaligned = []
 
-def verify_rtl_formatting(doc):
-    """Verify RTL (bidi) formatting applied"""
     total_paragraphs = 0
     rtl_formatted = 0
+    missing_rtl_count = 0
     missing_rtl = []
 
-    for idx, para in enumerate(doc.paragraphs):
-        if para.text.strip():
+    # Non-empty (location, text) pairs for the English scan
+    texts = []
+
+    # Paragraphs, then table cells
+    for block in iter_blocks(docx_path):
+        # Alignment: every table cell, judged by its first paragraph
+        if block.is_cell:
+            total_cells += 1
+
+            if block.right_aligned:
+                right_aligned += 1
+            else:
+                # A cell with no paragraph can't be right-aligned either; it
+                # is counted but, as before, not listed
+                misaligned_count += 1
+                if block.has_paragraphs and len(misaligned) < MAX_LOCATIONS:
+                    misaligned.append(block.location)
+
+        if not block.text.strip():
+            continue
+
+        # RTL: every non-empty paragraph and cell
+        if block.has_paragraphs:
             total_paragraphs += 1
 
-            if para.paragraph_format.bidi:
+            if block.bidi:
                 rtl_formatted += 1
             else:
-                missing_rtl.append(f"Paragraph {idx + 1}")
+                missing_rtl_count += 1
+                if len(missing_rtl) < MAX_LOCATIONS:
+                    missing_rtl.append(block.location)
 
-    # Check tables
-    for t_idx, table in enumerate(doc.tables):
-        for r_idx, row in enumerate(table.rows):
-            for c_idx, cell in enumerate(row.cells):
-                if cell.paragraphs and cell.text.strip():
-                    total_paragraphs += 1
+        texts.append((block.location, block.text))
 
-                    if cell.paragraphs[0].paragraph_format.bidi:
-                        rtl_formatted += 1
-                    else:
-                        missing_rtl.append(f"Table {t_idx + 1}, Row {r_idx + 1}, Col {c_idx + 1}")
+    # English words not in allowed set, compared case-insensitively
+    allowed_upper = frozenset(word.upper() for word in allowed_english)
+    unauthorized_count, unauthorized = scan_english(texts, allowed_upper)
 
-    percentage = (rtl_formatted / total_paragraphs * 100) if total_paragraphs > 0 else 0
+    alignment_percentage = (right_aligned / total_cells * 100) if total_cells > 0 else 0
+    rtl_percentage = (rtl_formatted / total_paragraphs * 100) if total_paragraphs > 0 else 0
 
     return {
-        'total': total_paragraphs,
-        'rtl_formatted': rtl_formatted,
-        'percentage': percentage,
-        'missing_rtl': missing_rtl[:10]
+        'alignment': {
+            'total': total_cells,
+            'right_aligned': right_aligned,
+            'percentage': alignment_percentage,
+            'misaligned_count': misaligned_count,
+            'misaligned': misaligned  # First 10 only
+        },
+        'rtl': {
+            'total': total_paragraphs,
+            'rtl_formatted': rtl_formatted,
+            'percentage': rtl_percentage,
+            'missing_rtl_count': missing_rtl_count,
+            'missing_rtl': missing_rtl
+        },
+        'unauthorized_count': unauthorized_count,
+        'unauthorized': unauthorized,
     }
 
 
+def write_lines(lines):
+    """Write buffered report lines to stdout in one call and clear them"""
+    sys.stdout.write('\n'.join(lines) + '\n')
+    lines.clear()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Verify RTL-translated DOCX document'
@@ -217,111 +388,131 @@ def main():
     parser.add_argument('arabic_docx', help='Arabic DOCX file to verify')
     parser.add_argument('english_docx', help='English DOCX file (reference)')
     parser.add_argument('translation_dict', help='Translation dictionary JSON')
+    parser.add_argument(
+        '--fast-fail',
+        action='store_true',
+        help='Stop after the structure check if it fails, skipping the content scans'
+    )
 
     args = parser.parse_args()
 
-    print("="*80)
-    print("RTL DOCUMENT VERIFICATION")
-    print("="*80)
+    # Report lines are collected and written before each slow step
+    out = []
+    out.append("="*80)
+    out.append("RTL DOCUMENT VERIFICATION")
+    out.append("="*80)
 
     # Load documents
-    print(f"\n[1/6] Loading documents...")
+    out.append(f"\n[1/6] Loading documents...")
+    write_lines(out)
     ar_doc = Document(args.arabic_docx)
     eng_doc = Document(args.english_docx)
 
-    with open(args.translation_dict, 'r', encoding='utf-8') as f:
-        translation_dict = json.load(f)
+    translation_dict = load_translation_dict(args.translation_dict)
 
-    print(f"   Arabic: {args.arabic_docx}")
-    print(f"   English: {args.english_docx}")
-    print(f"   Dictionary: {len(translation_dict)} entries")
+    out.append(f"   Arabic: {args.arabic_docx}")
+    out.append(f"   English: {args.english_docx}")
+    out.append(f"   Dictionary: {len(translation_dict)} entries")
 
     # Check 1: Structure
-    print(f"\n[2/6] Verifying structure...")
+    out.append(f"\n[2/6] Verifying structure...")
     structure_results = verify_structure(ar_doc, eng_doc)
 
     for result in structure_results:
         status_icon = '✓' if result['status'] == 'PASS' else '✗'
         if result['status'] == 'PASS':
-            print(f"   {status_icon} {result['check']}: {result['value']}")
+            out.append(f"   {status_icon} {result['check']}: {result['value']}")
         else:
-            print(f"   {status_icon} {result['check']}: Expected {result['expected']}, Got {result['actual']}")
+            out.append(f"   {status_icon} {result['check']}: Expected {result['expected']}, Got {result['actual']}")
+
+    structure_ok = all(r['status'] == 'PASS' for r in structure_results)
+    if args.fast_fail and not structure_ok:
+        out.append("\n" + "="*80)
+        out.append("⚠️  STRUCTURE MISMATCH - remaining checks skipped (--fast-fail)")
+        out.append("="*80)
+        write_lines(out)
+        sys.exit(1)
+    write_lines(out)
+
+    # Alignment, RTL and English checks share one pass over the Arabic document
+    allowed_english = load_allowed_english(translation_dict)
+    content_results = verify_all(args.arabic_docx, allowed_english)
 
     # Check 2: Alignment
-    print(f"\n[3/6] Verifying alignment...")
-    alignment_result = verify_alignment(ar_doc)
+    out.append(f"\n[3/6] Verifying alignment...")
+    alignment_result = content_results['alignment']
 
-    print(f"   Total cells: {alignment_result['total']}")
-    print(f"   Right-aligned: {alignment_result['right_aligned']}/{alignment_result['total']} ({alignment_result['percentage']:.1f}%)")
+    out.append(f"   Total cells: {alignment_result['total']}")
+    out.append(f"   Right-aligned: {alignment_result['right_aligned']}/{alignment_result['total']} ({alignment_result['percentage']:.1f}%)")
 
     if alignment_result['misaligned']:
-        print(f"   ✗ Misaligned cells (first 10):")
+        out.append(f"   ✗ Misaligned cells (first 10):")
         for loc in alignment_result['misaligned']:
-            print(f"      - {loc}")
+            out.append(f"      - {format_location(loc)}")
 
     # Check 3: RTL Formatting
-    print(f"\n[4/6] Verifying RTL formatting...")
-    rtl_result = verify_rtl_formatting(ar_doc)
+    out.append(f"\n[4/6] Verifying RTL formatting...")
+    rtl_result = content_results['rtl']
 
-    print(f"   Total elements: {rtl_result['total']}")
-    print(f"   RTL formatted: {rtl_result['rtl_formatted']}/{rtl_result['total']} ({rtl_result['percentage']:.1f}%)")
+    out.append(f"   Total elements: {rtl_result['total']}")
+    out.append(f"   RTL formatted: {rtl_result['rtl_formatted']}/{rtl_result['total']} ({rtl_result['percentage']:.1f}%)")
 
     if rtl_result['missing_rtl']:
-        print(f"   ✗ Missing RTL (first 10):")
+        out.append(f"   ✗ Missing RTL (first 10):")
         for loc in rtl_result['missing_rtl']:
-            print(f"      - {loc}")
+            out.append(f"      - {format_location(loc)}")
 
     # Check 4: English Words
-    print(f"\n[5/6] Scanning for unauthorized English...")
-    allowed_english = load_allowed_english(translation_dict)
-    print(f"   Allowed English: {sorted(allowed_english)}")
+    out.append(f"\n[5/6] Scanning for unauthorized English...")
+    out.append(f"   Allowed English: {sorted(allowed_english)}")
 
-    unauthorized = scan_for_unauthorized_english(ar_doc, allowed_english)
+    unauthorized_count = content_results['unauthorized_count']
 
-    if unauthorized:
-        print(f"   ✗ Found {len(unauthorized)} unauthorized English words:")
-        for loc, word in unauthorized[:20]:  # First 20
-            print(f"      - {word} at {loc}")
+    if unauthorized_count:
+        out.append(f"   ✗ Found {unauthorized_count} unauthorized English words:")
+        for loc, word in content_results['unauthorized']:  # First 20
+            out.append(f"      - {word} at {format_location(loc)}")
     else:
-        print(f"   ✓ No unauthorized English found")
+        out.append(f"   ✓ No unauthorized English found")
 
     # Summary
-    print(f"\n[6/6] Generating summary...")
+    out.append(f"\n[6/6] Generating summary...")
 
     all_pass = (
-        all(r['status'] == 'PASS' for r in structure_results) and
+        structure_ok and
         alignment_result['percentage'] == 100 and
         rtl_result['percentage'] == 100 and
-        len(unauthorized) == 0
+        unauthorized_count == 0
     )
 
-    print("\n" + "="*80)
+    out.append("\n" + "="*80)
     if all_pass:
-        print("✅ ALL CHECKS PASSED")
-        print("\nDocument is ready for delivery:")
-        print(f"  - Structure matches English exactly")
-        print(f"  - All cells right-aligned ({alignment_result['total']} cells)")
-        print(f"  - All elements RTL-formatted ({rtl_result['total']} elements)")
-        print(f"  - No unauthorized English found")
+        out.append("✅ ALL CHECKS PASSED")
+        out.append("\nDocument is ready for delivery:")
+        out.append(f"  - Structure matches English exactly")
+        out.append(f"  - All cells right-aligned ({alignment_result['total']} cells)")
+        out.append(f"  - All elements RTL-formatted ({rtl_result['total']} elements)")
+        out.append(f"  - No unauthorized English found")
     else:
-        print("⚠️  SOME CHECKS FAILED")
-        print("\nIssues found:")
+        out.append("⚠️  SOME CHECKS FAILED")
+        out.append("\nIssues found:")
 
-        if not all(r['status'] == 'PASS' for r in structure_results):
-            print("  - Structure mismatch (see above)")
+        if not structure_ok:
+            out.append("  - Structure mismatch (see above)")
 
         if alignment_result['percentage'] != 100:
-            print(f"  - {alignment_result['total'] - alignment_result['right_aligned']} cells not right-aligned")
+            out.append(f"  - {alignment_result['misaligned_count']} cells not right-aligned")
 
         if rtl_result['percentage'] != 100:
-            print(f"  - {rtl_result['total'] - rtl_result['rtl_formatted']} elements missing RTL formatting")
+            out.append(f"  - {rtl_result['missing_rtl_count']} elements missing RTL formatting")
 
-        if unauthorized:
-            print(f"  - {len(unauthorized)} unauthorized English words found")
+        if unauthorized_count:
+            out.append(f"  - {unauthorized_count} unauthorized English words found")
 
-        print("\nReview details above and fix issues before delivery.")
+        out.append("\nReview details above and fix issues before delivery.")
 
-    print("="*80)
+    out.append("="*80)
+    write_lines(out)
 
     # Exit code
     sys.exit(0 if all_pass else 1)